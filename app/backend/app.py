@@ -733,6 +733,8 @@ async def close_clients():
     await current_app.config[CONFIG_BLOB_CONTAINER_CLIENT].close()
     if current_app.config.get(CONFIG_USER_BLOB_CONTAINER_CLIENT):
         await current_app.config[CONFIG_USER_BLOB_CONTAINER_CLIENT].close()
+    if current_app.config.get(CONFIG_INGESTER):
+        await current_app.config[CONFIG_INGESTER].teardown()
 
 
 def create_app():
@@ -238,10 +238,14 @@ def setup_image_embeddings_service(
 
 
 async def main(strategy: Strategy, setup_index: bool = True):
-    if setup_index:
-        await strategy.setup()
-
-    await strategy.run()
+    try:
+        if setup_index:
+            await strategy.setup()
+
+        await strategy.run()
+    finally:
+        # Parsers keep their service clients open across documents; release them on the way out
+        await strategy.teardown()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
+import asyncio
 import datetime
+import functools
+import hashlib
 import io
 import logging
 import os
@@ -14,12 +17,29 @@ from azure.storage.blob import (
 )
 from azure.storage.blob.aio import BlobServiceClient, ContainerClient
 from PIL import Image, ImageDraw, ImageFont
-from pypdf import PdfReader
 
 from .listfilestrategy import File
 
 logger = logging.getLogger("scripts")
 
+# Number of page image uploads that may be in flight at once
+UPLOAD_CONCURRENCY = 8
+
+# Number of blobs deleted per multi-delete request (the service caps a batch at 256 subrequests)
+DELETE_BATCH_SIZE = 256
+
+
+@functools.lru_cache(maxsize=1)
+def load_overlay_font():
+    """Load the font for the page image overlay once per process, since parsing a font file is pure disk I/O"""
+    for font_path in ("arial.ttf", "/usr/share/fonts/truetype/freefont/FreeMono.ttf"):
+        try:
+            return ImageFont.truetype(font_path, 20)
+        except OSError:
+            continue
+    logger.info("Unable to find arial.ttf or FreeMono.ttf, using default font")
+    return ImageFont.load_default()
+
 
 class BlobManager:
     """
@@ -35,12 +55,16 @@ class BlobManager:
         resourceGroup: str,
         subscriptionId: str,
         store_page_images: bool = False,
+        draw_source_overlay: bool = False,
     ):
         self.endpoint = endpoint
         self.credential = credential
         self.account = account
         self.container = container
         self.store_page_images = store_page_images
+        # When enabled, a "SourceFileName:" text strip is composited onto each page image;
+        # the blob name already carries the filename, so the overlay is off by default
+        self.draw_source_overlay = draw_source_overlay
         self.resourceGroup = resourceGroup
         self.subscriptionId = subscriptionId
         self.user_delegation_key: Optional[UserDelegationKey] = None
@@ -55,13 +79,13 @@ class BlobManager:
             # Re-open and upload the original file
             if file.url is None:
                 with open(file.content.name, "rb") as reopened_file:
-                    blob_name = BlobManager.blob_name_from_file_name(file.content.name)
+                    blob_name = file.filename()
                     logger.info("Uploading blob for whole file -> %s", blob_name)
                     blob_client = await container_client.upload_blob(blob_name, reopened_file, overwrite=True)
                     file.url = blob_client.url
 
             if self.store_page_images:
-                if os.path.splitext(file.content.name)[1].lower() == ".pdf":
+                if file.file_extension().lower() == ".pdf":
                     return await self.upload_pdf_blob_images(service_client, container_client, file)
                 else:
                     logger.info("File %s is not a PDF, skipping image upload", file.content.name)
@@ -74,35 +98,43 @@ class BlobManager:
     async def upload_pdf_blob_images(
         self, service_client: BlobServiceClient, container_client: ContainerClient, file: File
     ) -> List[str]:
-        with open(file.content.name, "rb") as reopened_file:
-            reader = PdfReader(reopened_file)
-            page_count = len(reader.pages)
-        doc = pymupdf.open(file.content.name)
-        sas_uris = []
         start_time = datetime.datetime.now(datetime.timezone.utc)
         expiry_time = start_time + datetime.timedelta(days=1)
 
-        font = None
-        try:
-            font = ImageFont.truetype("arial.ttf", 20)
-        except OSError:
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/freefont/FreeMono.ttf", 20)
-            except OSError:
-                logger.info("Unable to find arial.ttf or FreeMono.ttf, using default font")
+        font = load_overlay_font() if self.draw_source_overlay else None
+
+        # Hash the source file once; each page blob records it so unchanged files can be skipped on re-ingestion
+        with open(file.content.name, "rb") as reopened_file:
+            file_md5 = hashlib.md5(reopened_file.read()).hexdigest()
+
+        # A single listing call fetches every existing page blob and its metadata,
+        # instead of issuing per-page existence checks against the storage account
+        prefix = os.path.splitext(file.filename())[0] + "-"
+        existing_page_blobs = {
+            blob.name: (blob.metadata or {}).get("md5")
+            async for blob in container_client.list_blobs(name_starts_with=prefix, include=["metadata"])
+        }
 
-        for i in range(page_count):
-            blob_name = BlobManager.blob_image_name_from_file_page(file.content.name, i)
-            logger.info("Converting page %s to image and uploading -> %s", i, blob_name)
+        # Fetch the delegation key once up front, so the concurrent page uploads don't each request their own
+        if not self.user_delegation_key:
+            self.user_delegation_key = await service_client.get_user_delegation_key(start_time, expiry_time)
 
-            doc = pymupdf.open(file.content.name)
+        def render_page_png(i: int, blob_name: str) -> bytes:
             page = doc.load_page(i)
-            pix = page.get_pixmap()
-            original_img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)  # type: ignore
+            # Grayscale at 150 DPI keeps the preview legible while storing one byte per pixel
+            # instead of three, which shrinks both the PNG encode work and the uploaded bytes
+            pix = page.get_pixmap(matrix=pymupdf.Matrix(150 / 72, 150 / 72), colorspace=pymupdf.csGRAY, alpha=False)
+            if not self.draw_source_overlay:
+                # No compositing to do, so encode straight from the pixmap with no PIL allocations
+                return pix.tobytes("png")
+            original_img = Image.frombytes("L", [pix.width, pix.height], pix.samples)  # type: ignore
+            # Drop the pixmap as soon as the pixels are copied out, releasing its C buffer
+            # before the compositing work below rather than at the end of the function
+            pix = None
 
             # Create a new image with additional space for text
             text_height = 40  # Height of the text area
-            new_img = Image.new("RGB", (original_img.width, original_img.height + text_height), "white")
+            new_img = Image.new("L", (original_img.width, original_img.height + text_height), "white")
 
             # Paste the original image onto the new image
             new_img.paste(original_img, (0, text_height))
@@ -117,26 +149,78 @@ class BlobManager:
             draw.text((x, y), text, font=font, fill="black")
 
             output = io.BytesIO()
-            new_img.save(output, format="PNG")
-            output.seek(0)
-
-            blob_client = await container_client.upload_blob(blob_name, output, overwrite=True)
-            if not self.user_delegation_key:
-                self.user_delegation_key = await service_client.get_user_delegation_key(start_time, expiry_time)
-
-            if blob_client.account_name is not None:
-                sas_token = generate_blob_sas(
-                    account_name=blob_client.account_name,
-                    container_name=blob_client.container_name,
-                    blob_name=blob_client.blob_name,
-                    user_delegation_key=self.user_delegation_key,
-                    permission=BlobSasPermissions(read=True),
-                    expiry=expiry_time,
-                    start=start_time,
-                )
-                sas_uris.append(f"{blob_client.url}?{sas_token}")
-
-        return sas_uris
+            # These images are transient citation previews, so favor encode speed over compression ratio
+            new_img.save(output, format="PNG", compress_level=1)
+            return output.getvalue()
+
+        # Pipeline the CPU-bound render/encode with the network-bound uploads: a single producer renders
+        # pages in a worker thread (pymupdf documents are not safe to share across threads) while a pool
+        # of consumers uploads the finished pages, so rendering page j+1 overlaps the upload of page j.
+        render_queue: asyncio.Queue[Optional[tuple[int, str, bytes]]] = asyncio.Queue(maxsize=UPLOAD_CONCURRENCY)
+        sas_uris: dict[int, Optional[str]] = {}
+        upload_errors: list[Exception] = []
+
+        async def produce_pages():
+            try:
+                for i in range(doc.page_count):
+                    blob_name = BlobManager.blob_image_name_from_file_page(file.filename(), i)
+                    if existing_page_blobs.get(blob_name) == file_md5:
+                        logger.info("Blob %s already exists with the same content, skipping upload", blob_name)
+                        sas_uris[i] = self._blob_sas_uri(
+                            container_client.get_blob_client(blob_name), start_time, expiry_time
+                        )
+                        continue
+                    logger.info("Converting page %s to image and uploading -> %s", i, blob_name)
+                    png_bytes = await asyncio.to_thread(render_page_png, i, blob_name)
+                    await render_queue.put((i, blob_name, png_bytes))
+            finally:
+                # Always deliver one sentinel per consumer, even if rendering failed part-way
+                for _ in range(UPLOAD_CONCURRENCY):
+                    await render_queue.put(None)
+
+        async def upload_pages():
+            while (queued_page := await render_queue.get()) is not None:
+                i, blob_name, png_bytes = queued_page
+                try:
+                    # max_concurrency lets the SDK upload the blob's chunks in parallel
+                    blob_client = await container_client.upload_blob(
+                        blob_name,
+                        png_bytes,
+                        overwrite=True,
+                        metadata={"md5": file_md5},
+                        length=len(png_bytes),
+                        max_concurrency=8,
+                    )
+                    sas_uris[i] = self._blob_sas_uri(blob_client, start_time, expiry_time)
+                except Exception as upload_error:
+                    # Keep draining the queue so the producer never blocks on a full queue
+                    upload_errors.append(upload_error)
+
+        # Open the document once for all pages; re-opening per page re-parses the whole PDF
+        doc = pymupdf.open(file.content.name)
+        try:
+            await asyncio.gather(produce_pages(), *[upload_pages() for _ in range(UPLOAD_CONCURRENCY)])
+        finally:
+            doc.close()
+        if upload_errors:
+            raise upload_errors[0]
+        return [sas_uri for i in sorted(sas_uris) if (sas_uri := sas_uris[i]) is not None]
+
+    def _blob_sas_uri(
+        self, blob_client, start_time: datetime.datetime, expiry_time: datetime.datetime
+    ) -> Optional[str]:
+        if blob_client.account_name is None:
+            return None
+        sas_token = generate_blob_sas(
+            account_name=blob_client.account_name,
+            container_name=blob_client.container_name,
+            blob_name=blob_client.blob_name,
+            user_delegation_key=self.user_delegation_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=expiry_time,
+            start=start_time,
+        )
+        return f"{blob_client.url}?{sas_token}"
 
     async def remove_blob(self, path: Optional[str] = None):
         async with BlobServiceClient(
@@ -145,22 +229,28 @@ class BlobManager:
             if not await container_client.exists():
                 return
             if path is None:
-                prefix = None
+                blob_name = None
+                page_pattern = None
                 blobs = container_client.list_blob_names()
             else:
-                prefix = os.path.splitext(os.path.basename(path))[0]
-                blobs = container_client.list_blob_names(name_starts_with=os.path.splitext(os.path.basename(prefix))[0])
+                blob_name = os.path.basename(path)
+                prefix = os.path.splitext(blob_name)[0]
+                # Compile the page-blob pattern once outside the loop; re.escape guards
+                # against filenames that contain regex metacharacters
+                page_pattern = re.compile(rf"{re.escape(prefix)}-\d+\.(?:pdf|png)$")
+                blobs = container_client.list_blob_names(name_starts_with=prefix)
+            to_delete: List[str] = []
             async for blob_path in blobs:
                 # This still supports PDFs split into individual pages, but we could remove in future to simplify code
-                if (
-                    prefix is not None
-                    and (
-                        not re.match(rf"{prefix}-\d+\.pdf", blob_path) or not re.match(rf"{prefix}-\d+\.png", blob_path)
-                    )
-                ) or (path is not None and blob_path == os.path.basename(path)):
+                if page_pattern is not None and not (page_pattern.match(blob_path) or blob_path == blob_name):
                     continue
                 logger.info("Removing blob %s", blob_path)
-                await container_client.delete_blob(blob_path)
+                to_delete.append(blob_path)
+                if len(to_delete) >= DELETE_BATCH_SIZE:
+                    await container_client.delete_blobs(*to_delete)
+                    to_delete = []
+            if to_delete:
+                await container_client.delete_blobs(*to_delete)
 
     @classmethod
     def sourcepage_from_file_page(cls, filename, page=0) -> str:
@@ -87,8 +87,16 @@ class FileStrategy(Strategy):
                 raise ValueError(
                     "AzureKeyCredential is not supported for Content Understanding, use keyless auth instead"
                 )
-            cu_manager = ContentUnderstandingDescriber(self.content_understanding_endpoint, self.search_info.credential)
-            await cu_manager.create_analyzer()
+            async with ContentUnderstandingDescriber(
+                self.content_understanding_endpoint, self.search_info.credential
+            ) as cu_manager:
+                await cu_manager.create_analyzer()
+
+    async def teardown(self):
+        # Several extensions map to the same parser instance, so dedupe by identity
+        # and close each underlying client/session exactly once
+        for parser in {id(processor.parser): processor.parser for processor in self.file_processors.values()}.values():
+            await parser.aclose()
 
     async def run(self):
         search_manager = SearchManager(
@@ -148,3 +156,9 @@ class UploadUserFileStrategy:
             logging.warning("Filename is required to remove a file")
             return
         await self.search_manager.remove_content(filename, oid)
+
+    async def teardown(self):
+        # Several extensions map to the same parser instance, so dedupe by identity
+        # and close each underlying client/session exactly once
+        for parser in {id(processor.parser): processor.parser for processor in self.file_processors.values()}.values():
+            await parser.aclose()
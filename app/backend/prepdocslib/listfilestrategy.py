@@ -26,12 +26,20 @@ class File:
         self.content = content
         self.acls = acls or {}
         self.url = url
+        # Lazily cached path components, since the name never changes but the ingestion
+        # loops would otherwise re-parse it on every filename()/file_extension() call
+        self._filename: Optional[str] = None
+        self._file_extension: Optional[str] = None
 
     def filename(self):
-        return os.path.basename(self.content.name)
+        if self._filename is None:
+            self._filename = os.path.basename(self.content.name)
+        return self._filename
 
     def file_extension(self):
-        return os.path.splitext(self.content.name)[1]
+        if self._file_extension is None:
+            self._file_extension = os.path.splitext(self.content.name)[1]
+        return self._file_extension
 
     def filename_to_id(self):
         filename_ascii = re.sub("[^0-9a-zA-Z_-]", "_", self.filename())
@@ -12,3 +12,7 @@ class Parser(ABC):
     async def parse(self, content: IO) -> AsyncGenerator[Page, None]:
         if False:
             yield  # pragma: no cover - this is necessary for mypy to type check
+
+    async def aclose(self) -> None:
+        """Release any long-lived resources held across parses; most parsers hold none"""
+        pass
@@ -1,9 +1,13 @@
-import html
-import io
+import asyncio
 import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from operator import attrgetter
 from typing import IO, AsyncGenerator, Union
 
+import numpy as np
 import pymupdf
 from azure.ai.documentintelligence.aio import DocumentIntelligenceClient
 from azure.ai.documentintelligence.models import (
@@ -11,12 +15,11 @@ from azure.ai.documentintelligence.models import (
     AnalyzeResult,
     DocumentFigure,
     DocumentTable,
+    DocumentTableCell,
 )
 from azure.core.credentials import AzureKeyCredential
 from azure.core.credentials_async import AsyncTokenCredential
 from azure.core.exceptions import HttpResponseError
-from PIL import Image
-from pypdf import PdfReader
 
 from .mediadescriber import ContentUnderstandingDescriber
 from .page import Page
@@ -24,21 +27,123 @@ from .parser import Parser
 
 logger = logging.getLogger("scripts")
 
+# Maximum number of figure descriptions in flight at once for a single document
+FIGURE_CONCURRENCY = 8
+
+# Below this page count, spawning worker processes costs more than the parallel extraction saves
+PARALLEL_EXTRACT_MIN_PAGES = 32
+
+# PDFs at or above this page count are split into ranges of the chunk size below and
+# analyzed concurrently by Document Intelligence
+ANALYZE_CONCURRENT_MIN_PAGES = 40
+ANALYZE_CHUNK_PAGES = 20
+
+# Same escapes as html.escape(s, quote=True), applied in one C-level pass per cell
+# instead of five str.replace passes
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+
+class ObjectType(Enum):
+    NONE = -1
+    TABLE = 0
+    FIGURE = 1
+
+
+def _extract_page_range_text(pdf_bytes: bytes, start: int, stop: int) -> list[str]:
+    """Extract the text of a contiguous page range; runs in a worker process, which opens its
+    own copy of the document since MuPDF handles cannot cross process boundaries"""
+    doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        return [doc.load_page(page_num).get_text() for page_num in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _mark_object_spans(
+    object_types: np.ndarray, object_indices: np.ndarray, objects, object_type: int, page_offset: int
+) -> None:
+    """Label every character position covered by the objects' spans using slice assignment,
+    so the marking cost is per span rather than per character"""
+    page_length = len(object_types)
+    for object_idx, object_on_page in enumerate(objects):
+        for span in object_on_page.spans:
+            span_start = max(span.offset - page_offset, 0)
+            span_end = min(span.offset - page_offset + span.length, page_length)
+            if span_start < span_end:
+                object_types[span_start:span_end] = object_type
+                object_indices[span_start:span_end] = object_idx
+
+
+def _split_pdf_bytes(content_bytes: bytes) -> list[bytes]:
+    """Split a large PDF into byte buffers of at most ANALYZE_CHUNK_PAGES pages each, so the
+    ranges can be analyzed concurrently; returns the original buffer unchanged for non-PDF
+    documents and for PDFs small enough that one submission is cheaper"""
+    try:
+        doc = pymupdf.open(stream=content_bytes, filetype="pdf")
+    except Exception:
+        return [content_bytes]
+    try:
+        if doc.page_count < ANALYZE_CONCURRENT_MIN_PAGES:
+            return [content_bytes]
+        chunks = []
+        for range_start in range(0, doc.page_count, ANALYZE_CHUNK_PAGES):
+            range_doc = pymupdf.open()
+            range_doc.insert_pdf(
+                doc, from_page=range_start, to_page=min(range_start + ANALYZE_CHUNK_PAGES, doc.page_count) - 1
+            )
+            chunks.append(range_doc.tobytes())
+            range_doc.close()
+        return chunks
+    finally:
+        doc.close()
+
+
+def _build_runs(object_types: np.ndarray, object_indices: np.ndarray) -> np.ndarray:
+    """Return the boundaries of maximal runs of identical (type, index) labels, so the page
+    text can be emitted one run at a time instead of one character at a time"""
+    run_changes = (np.diff(object_types) != 0) | (np.diff(object_indices) != 0)
+    return np.concatenate(([0], np.flatnonzero(run_changes) + 1, [len(object_types)]))
+
 
 class LocalPdfParser(Parser):
     """
-    Concrete parser backed by PyPDF that can parse PDFs into pages
-    To learn more, please visit https://pypi.org/project/pypdf/
+    Concrete parser backed by PyMuPDF that can parse PDFs into pages
+    To learn more, please visit https://pymupdf.readthedocs.io/
     """
 
     async def parse(self, content: IO) -> AsyncGenerator[Page, None]:
-        logger.info("Extracting text from '%s' using local PDF parser (pypdf)", content.name)
+        logger.info("Extracting text from '%s' using local PDF parser (PyMuPDF)", content.name)
 
-        reader = PdfReader(content)
-        pages = reader.pages
+        pdf_bytes = content.read()
+        doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
+        try:
+            page_count = doc.page_count
+            if page_count < PARALLEL_EXTRACT_MIN_PAGES:
+                page_texts = [doc.load_page(page_num).get_text() for page_num in range(page_count)]
+            else:
+                # Text extraction is CPU-bound and independent per page, so fan contiguous
+                # page ranges out to one worker process per core and reassemble in order
+                max_workers = os.cpu_count() or 1
+                pages_per_worker = -(-page_count // max_workers)
+                loop = asyncio.get_running_loop()
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    range_texts = await asyncio.gather(
+                        *[
+                            loop.run_in_executor(
+                                executor,
+                                _extract_page_range_text,
+                                pdf_bytes,
+                                range_start,
+                                min(range_start + pages_per_worker, page_count),
+                            )
+                            for range_start in range(0, page_count, pages_per_worker)
+                        ]
+                    )
+                page_texts = [page_text for texts in range_texts for page_text in texts]
+        finally:
+            doc.close()
         offset = 0
-        for page_num, p in enumerate(pages):
-            page_text = p.extract_text()
+        for page_num, page_text in enumerate(page_texts):
             yield Page(page_num=page_num, offset=offset, text=page_text)
             offset += len(page_text)
 
@@ -62,35 +167,85 @@ class DocumentAnalysisParser(Parser):
         self.credential = credential
         self.use_content_understanding = use_content_understanding
         self.content_understanding_endpoint = content_understanding_endpoint
+        self._document_intelligence_client: Union[DocumentIntelligenceClient, None] = None
+        self._cu_describer: Union[ContentUnderstandingDescriber, None] = None
+
+    async def __aenter__(self) -> "DocumentAnalysisParser":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _get_document_intelligence_client(self) -> DocumentIntelligenceClient:
+        """Lazily create one long-lived client, so a directory ingest doesn't pay a fresh TLS
+        handshake, connection pool, and auth exchange for every document"""
+        if self._document_intelligence_client is None:
+            self._document_intelligence_client = DocumentIntelligenceClient(
+                endpoint=self.endpoint, credential=self.credential
+            )
+        return self._document_intelligence_client
+
+    async def aclose(self) -> None:
+        if self._document_intelligence_client is not None:
+            await self._document_intelligence_client.close()
+            self._document_intelligence_client = None
+        if self._cu_describer is not None:
+            await self._cu_describer.aclose()
+            self._cu_describer = None
+
+    async def parse_batch(self, contents: list[IO]) -> list[list[Page]]:
+        """
+        Analyzes several documents concurrently and returns their pages in input order.
+
+        The Document Intelligence batch API requires inputs to already live in blob storage,
+        while this pipeline streams documents from local files, so instead the individual
+        analyses are submitted together and their pollers awaited concurrently — the
+        per-document polling intervals overlap rather than accumulate.
+        """
+        if len(contents) == 1:
+            return [[page async for page in self.parse(contents[0])]]
+
+        async def collect(content: IO) -> list[Page]:
+            return [page async for page in self.parse(content)]
+
+        return list(await asyncio.gather(*[collect(content) for content in contents]))
 
     async def parse(self, content: IO) -> AsyncGenerator[Page, None]:
         logger.info("Extracting text from '%s' using Azure Document Intelligence", content.name)
 
-        async with DocumentIntelligenceClient(
-            endpoint=self.endpoint, credential=self.credential
-        ) as document_intelligence_client:
-            file_analyzed = False
-            if self.use_content_understanding:
-                if self.content_understanding_endpoint is None:
-                    raise ValueError("Content Understanding is enabled but no endpoint was provided")
-                if isinstance(self.credential, AzureKeyCredential):
-                    raise ValueError(
-                        "AzureKeyCredential is not supported for Content Understanding, use keyless auth instead"
-                    )
-                cu_describer = ContentUnderstandingDescriber(self.content_understanding_endpoint, self.credential)
-                content_bytes = content.read()
+        document_intelligence_client = self._get_document_intelligence_client()
+        cu_describer: Union[ContentUnderstandingDescriber, None] = None
+        # Read the document once; the same buffer backs both the analyze request and,
+        # when figures are described, the pymupdf document used for cropping
+        content_bytes = content.read()
+        if self.use_content_understanding:
+            if self.content_understanding_endpoint is None:
+                raise ValueError("Content Understanding is enabled but no endpoint was provided")
+            if isinstance(self.credential, AzureKeyCredential):
+                raise ValueError(
+                    "AzureKeyCredential is not supported for Content Understanding, use keyless auth instead"
+                )
+            if self._cu_describer is None:
+                self._cu_describer = ContentUnderstandingDescriber(self.content_understanding_endpoint, self.credential)
+            cu_describer = self._cu_describer
+
+        async def analyze(chunk_bytes: bytes) -> tuple[AnalyzeResult, Union[pymupdf.Document, None]]:
+            """Submit one analysis and await its result, returning alongside it the pymupdf
+            document used for figure cropping when media description succeeded"""
+            if cu_describer is not None:
                 try:
                     poller = await document_intelligence_client.begin_analyze_document(
                         model_id="prebuilt-layout",
-                        analyze_request=AnalyzeDocumentRequest(bytes_source=content_bytes),
+                        analyze_request=AnalyzeDocumentRequest(bytes_source=chunk_bytes),
                         output=["figures"],
                         features=["ocrHighResolution"],
                         output_content_format="markdown",
                     )
-                    doc_for_pymupdf = pymupdf.open(stream=io.BytesIO(content_bytes))
-                    file_analyzed = True
+                    # pymupdf accepts the bytes directly; wrapping them in a BytesIO would
+                    # just hold a second copy of the document in memory
+                    doc_for_pymupdf = pymupdf.open(stream=chunk_bytes, filetype="pdf")
+                    return await poller.result(), doc_for_pymupdf
                 except HttpResponseError as e:
-                    content.seek(0)
                     if e.error and e.error.code == "InvalidArgument":
                         logger.error(
                             "This document type does not support media description. Proceeding with standard analysis."
@@ -100,87 +255,154 @@ class DocumentAnalysisParser(Parser):
                             "Unexpected error analyzing document for media description: %s. Proceeding with standard analysis.",
                             e,
                         )
+            # Same submission as above minus the figure outputs, reusing the buffer already in memory
+            poller = await document_intelligence_client.begin_analyze_document(
+                model_id=self.model_id, analyze_request=AnalyzeDocumentRequest(bytes_source=chunk_bytes)
+            )
+            return await poller.result(), None
+
+        # Large PDFs are split into page ranges that are analyzed concurrently, so the pages of
+        # early ranges reach the downstream splitter and embedder while the service is still
+        # working on later ones; small documents and non-PDFs stay a single submission
+        analysis_tasks = [
+            asyncio.ensure_future(analyze(chunk_bytes)) for chunk_bytes in _split_pdf_bytes(content_bytes)
+        ]
+
+        crop_lock = asyncio.Lock()
+        # One semaphore for the whole document, so a figure-dense page can't flood the
+        # Content Understanding service with more requests than the session pool supports
+        describe_semaphore = asyncio.Semaphore(FIGURE_CONCURRENCY)
+
+        offset = 0
+        page_num_base = 0
+        try:
+            for analysis_task in analysis_tasks:
+                analyze_result, doc_for_pymupdf = await analysis_task
+                try:
+                    async for page in self._pages_from_analysis(
+                        analyze_result, doc_for_pymupdf, cu_describer, crop_lock, describe_semaphore
+                    ):
+                        yield Page(page_num=page_num_base + page.page_num, offset=offset, text=page.text)
+                        offset += len(page.text)
+                    page_num_base += len(analyze_result.pages)
+                finally:
+                    # Release the MuPDF document (and its buffer) as soon as its range is
+                    # emitted, instead of keeping every range alive until the end
+                    if doc_for_pymupdf is not None:
+                        doc_for_pymupdf.close()
+        finally:
+            # The client and describer stay open for the next document; aclose() releases them.
+            # Cancel whatever is still in flight, then await everything so tasks that already
+            # completed (but were never consumed) can have their pymupdf documents closed
+            for analysis_task in analysis_tasks:
+                analysis_task.cancel()
+            for analysis_outcome in await asyncio.gather(*analysis_tasks, return_exceptions=True):
+                if isinstance(analysis_outcome, tuple) and analysis_outcome[1] is not None:
+                    if not analysis_outcome[1].is_closed:
+                        analysis_outcome[1].close()
+
+    async def _pages_from_analysis(
+        self,
+        analyze_result: AnalyzeResult,
+        doc_for_pymupdf: Union[pymupdf.Document, None],
+        cu_describer: Union[ContentUnderstandingDescriber, None],
+        crop_lock: asyncio.Lock,
+        describe_semaphore: asyncio.Semaphore,
+    ) -> AsyncGenerator[Page, None]:
+        """Assembles the text of each analyzed page, interleaving table and figure HTML;
+        page numbers and offsets are relative to this analysis and rebased by the caller"""
+        # Group tables and figures by page in a single pass over the analysis, so the per-page
+        # loop (and the figure describer) only ever touches the objects on the current page
+        tables_by_page: dict[int, list[DocumentTable]] = defaultdict(list)
+        for table in analyze_result.tables or []:
+            if table.bounding_regions:
+                tables_by_page[table.bounding_regions[0].page_number].append(table)
+        figures_by_page: dict[int, list[DocumentFigure]] = defaultdict(list)
+        if doc_for_pymupdf is not None:
+            for figure in analyze_result.figures or []:
+                if figure.bounding_regions:
+                    figures_by_page[figure.bounding_regions[0].page_number].append(figure)
 
-            if file_analyzed is False:
-                poller = await document_intelligence_client.begin_analyze_document(
-                    model_id=self.model_id, analyze_request=content, content_type="application/octet-stream"
+        # Pages already parsed for one figure crop are reused for the next; the cache is only
+        # ever touched under crop_lock, matching MuPDF's single-thread requirement
+        page_cache: dict[int, pymupdf.Page] = {}
+
+        async def describe_figure(figure: DocumentFigure, describer: ContentUnderstandingDescriber) -> str:
+            async with describe_semaphore:
+                return await DocumentAnalysisParser.figure_to_html(
+                    doc_for_pymupdf, figure, describer, crop_lock, page_cache
                 )
-            analyze_result: AnalyzeResult = await poller.result()
-
-            offset = 0
-            for page in analyze_result.pages:
-                tables_on_page = [
-                    table
-                    for table in (analyze_result.tables or [])
-                    if table.bounding_regions and table.bounding_regions[0].page_number == page.page_number
-                ]
-                figures_on_page = []
-                if self.use_content_understanding:
-                    figures_on_page = [
-                        figure
-                        for figure in (analyze_result.figures or [])
-                        if figure.bounding_regions and figure.bounding_regions[0].page_number == page.page_number
-                    ]
-
-                class ObjectType(Enum):
-                    NONE = -1
-                    TABLE = 0
-                    FIGURE = 1
-
-                page_offset = page.spans[0].offset
-                page_length = page.spans[0].length
-                mask_chars: list[tuple[ObjectType, Union[int, None]]] = [(ObjectType.NONE, None)] * page_length
-                # mark all positions of the table spans in the page
-                for table_idx, table in enumerate(tables_on_page):
-                    for span in table.spans:
-                        # replace all table spans with "table_id" in table_chars array
-                        for i in range(span.length):
-                            idx = span.offset - page_offset + i
-                            if idx >= 0 and idx < page_length:
-                                mask_chars[idx] = (ObjectType.TABLE, table_idx)
-                # mark all positions of the figure spans in the page
-                for figure_idx, figure in enumerate(figures_on_page):
-                    for span in figure.spans:
-                        # replace all figure spans with "figure_id" in figure_chars array
-                        for i in range(span.length):
-                            idx = span.offset - page_offset + i
-                            if idx >= 0 and idx < page_length:
-                                mask_chars[idx] = (ObjectType.FIGURE, figure_idx)
-
-                # build page text by replacing characters in table spans with table html
-                page_text = ""
-                added_objects = set()  # set of object types todo mypy
-                for idx, mask_char in enumerate(mask_chars):
-                    object_type, object_idx = mask_char
-                    if object_type == ObjectType.NONE:
-                        page_text += analyze_result.content[page_offset + idx]
-                    elif object_type == ObjectType.TABLE:
-                        if object_idx is None:
-                            raise ValueError("Expected object_idx to be set")
-                        if mask_char not in added_objects:
-                            page_text += DocumentAnalysisParser.table_to_html(tables_on_page[object_idx])
-                            added_objects.add(mask_char)
-                    elif object_type == ObjectType.FIGURE:
-                        if cu_describer is None:
-                            raise ValueError("cu_describer should not be None, unable to describe figure")
-                        if object_idx is None:
-                            raise ValueError("Expected object_idx to be set")
-                        if mask_char not in added_objects:
-                            figure_html = await DocumentAnalysisParser.figure_to_html(
-                                doc_for_pymupdf, figures_on_page[object_idx], cu_describer
-                            )
-                            page_text += figure_html
-                            added_objects.add(mask_char)
-                # We remove these comments since they are not needed and skew the page numbers
-                page_text = page_text.replace("<!-- PageBreak -->", "")
-                # We remove excess newlines at the beginning and end of the page
-                page_text = page_text.strip()
-                yield Page(page_num=page.page_number - 1, offset=offset, text=page_text)
-                offset += len(page_text)
+
+        offset = 0
+        for page in analyze_result.pages:
+            tables_on_page = tables_by_page.get(page.page_number, [])
+            figures_on_page = figures_by_page.get(page.page_number, [])
+
+            # Describe all figures on the page concurrently before assembling the page text;
+            # each description is an HTTP round-trip, so awaiting them one by one inside the
+            # character walk serialized the slowest part of the whole parse
+            figure_html_by_idx: dict[int, str] = {}
+            if figures_on_page:
+                if cu_describer is None:
+                    raise ValueError("cu_describer should not be None, unable to describe figure")
+                figure_htmls = await asyncio.gather(
+                    *[describe_figure(figure, cu_describer) for figure in figures_on_page]
+                )
+                figure_html_by_idx = dict(enumerate(figure_htmls))
+
+            page_offset = page.spans[0].offset
+            page_length = page.spans[0].length
+            if not tables_on_page and not figures_on_page:
+                # Nothing to interleave on this page, so its text is a single slice of the
+                # content; skip allocating and walking the label arrays entirely
+                page_text = analyze_result.content[page_offset : page_offset + page_length]
+            else:
+                # Label each character of the page with the object (if any) covering it;
+                # the label fits in a byte while the index needs the full int32 range
+                object_types = np.full(page_length, ObjectType.NONE.value, dtype=np.int8)
+                object_indices = np.full(page_length, -1, dtype=np.int32)
+                # mark all positions of the table spans and figure spans in the page
+                _mark_object_spans(object_types, object_indices, tables_on_page, ObjectType.TABLE.value, page_offset)
+                _mark_object_spans(object_types, object_indices, figures_on_page, ObjectType.FIGURE.value, page_offset)
+
+                # Build page text by walking maximal runs of identical labels, emitting whole
+                # slices of the content (or one HTML blob per table/figure)
+                run_bounds = _build_runs(object_types, object_indices)
+                # Render each table once up front so the emit loop below only indexes
+                # ready-made strings, and track emission with flat per-object flags
+                table_html_by_idx = [DocumentAnalysisParser.table_to_html(table) for table in tables_on_page]
+                table_emitted = bytearray(len(tables_on_page))
+                figure_emitted = bytearray(len(figures_on_page))
+                pieces: list[str] = []
+                for run_start, run_end in zip(run_bounds[:-1], run_bounds[1:]):
+                    if run_start == run_end:
+                        continue
+                    run_type = int(object_types[run_start])
+                    run_idx = int(object_indices[run_start])
+                    if run_type == ObjectType.NONE.value:
+                        pieces.append(analyze_result.content[page_offset + run_start : page_offset + run_end])
+                    elif run_type == ObjectType.TABLE.value:
+                        if not table_emitted[run_idx]:
+                            pieces.append(table_html_by_idx[run_idx])
+                            table_emitted[run_idx] = 1
+                    elif not figure_emitted[run_idx]:
+                        pieces.append(figure_html_by_idx[run_idx])
+                        figure_emitted[run_idx] = 1
+                page_text = "".join(pieces)
+            # We remove these comments since they are not needed and skew the page numbers
+            page_text = page_text.replace("<!-- PageBreak -->", "")
+            # We remove excess newlines at the beginning and end of the page
+            page_text = page_text.strip()
+            yield Page(page_num=page.page_number - 1, offset=offset, text=page_text)
+            offset += len(page_text)
 
     @staticmethod
     async def figure_to_html(
-        doc: pymupdf.Document, figure: DocumentFigure, cu_describer: ContentUnderstandingDescriber
+        doc: pymupdf.Document,
+        figure: DocumentFigure,
+        cu_describer: ContentUnderstandingDescriber,
+        crop_lock: Union[asyncio.Lock, None] = None,
+        page_cache: Union[dict[int, pymupdf.Page], None] = None,
     ) -> str:
         figure_title = (figure.caption and figure.caption.content) or ""
         logger.info("Describing figure %s with title '%s'", figure.id, figure_title)
@@ -197,19 +419,33 @@ class DocumentAnalysisParser(Parser):
             first_region.polygon[5],  # y1 (bottom)
         )
         page_number = first_region["pageNumber"]  # 1-indexed
-        cropped_img = DocumentAnalysisParser.crop_image_from_pdf_page(doc, page_number - 1, bounding_box)
+        # Rendering the crop is synchronous CPU work, so run it in a worker thread to keep the
+        # event loop free for the concurrent describe_image calls. MuPDF documents are not
+        # thread-safe, so callers cropping the same document concurrently share a lock.
+        if crop_lock is None:
+            crop_lock = asyncio.Lock()
+        async with crop_lock:
+            cropped_img = await asyncio.to_thread(
+                DocumentAnalysisParser.crop_image_from_pdf_page, doc, page_number - 1, bounding_box, page_cache
+            )
         figure_description = await cu_describer.describe_image(cropped_img)
         return f"<figure><figcaption>{figure_title}<br>{figure_description}</figcaption></figure>"
 
     @staticmethod
     def table_to_html(table: DocumentTable):
-        table_html = "<figure><table>"
-        rows = [
-            sorted([cell for cell in table.cells if cell.row_index == i], key=lambda cell: cell.column_index)
-            for i in range(table.row_count)
-        ]
+        # Bucket the cells by row in a single pass, rather than rescanning the full cell list per row
+        rows: list[list[DocumentTableCell]] = [[] for _ in range(table.row_count)]
+        for cell in table.cells:
+            rows[cell.row_index].append(cell)
+        column_index = attrgetter("column_index")
+        for row_cells in rows:
+            row_cells.sort(key=column_index)
+        # Collect the HTML fragments in a list and join once, to avoid quadratic string reallocation
+        parts = ["<figure><table>"]
+        # Bind the bound method once; the cell loop is the hottest spot in this function
+        append = parts.append
         for row_cells in rows:
-            table_html += "<tr>"
+            append("<tr>")
             for cell in row_cells:
                 tag = "th" if (cell.kind == "columnHeader" or cell.kind == "rowHeader") else "td"
                 cell_spans = ""
@@ -217,14 +453,17 @@ class DocumentAnalysisParser(Parser):
                     cell_spans += f" colSpan={cell.column_span}"
                 if cell.row_span is not None and cell.row_span > 1:
                     cell_spans += f" rowSpan={cell.row_span}"
-                table_html += f"<{tag}{cell_spans}>{html.escape(cell.content)}</{tag}>"
-            table_html += "</tr>"
-        table_html += "</table></figure>"
-        return table_html
+                append(f"<{tag}{cell_spans}>{cell.content.translate(_HTML_ESCAPE_TABLE)}</{tag}>")
+            append("</tr>")
+        append("</table></figure>")
+        return "".join(parts)
 
     @staticmethod
     def crop_image_from_pdf_page(
-        doc: pymupdf.Document, page_number: int, bounding_box: tuple[float, float, float, float]
+        doc: pymupdf.Document,
+        page_number: int,
+        bounding_box: tuple[float, float, float, float],
+        page_cache: Union[dict[int, pymupdf.Page], None] = None,
     ) -> bytes:
         """
         Crops a region from a given page in a PDF and returns it as an image.
@@ -232,19 +471,26 @@ class DocumentAnalysisParser(Parser):
         :param pdf_path: Path to the PDF file.
         :param page_number: The page number to crop from (0-indexed).
         :param bounding_box: A tuple of (x0, y0, x1, y1) coordinates for the bounding box.
-        :return: A PIL Image of the cropped area.
+        :param page_cache: Optional cache of loaded pages, so a page with many figures is parsed once.
+        :return: The JPEG-encoded bytes of the cropped area.
         """
-        page = doc.load_page(page_number)
+        if page_cache is not None:
+            page = page_cache.get(page_number)
+            if page is None:
+                page = page_cache[page_number] = doc.load_page(page_number)
+        else:
+            page = doc.load_page(page_number)
 
         # Cropping the page. The rect requires the coordinates in the format (x0, y0, x1, y1).
         bbx = [x * 72 for x in bounding_box]
         rect = pymupdf.Rect(bbx)
-        # Bounding box is scaled to 72 dots per inch
-        # We assume the PDF has 300 DPI
-        # The matrix is used to convert between these 2 units
-        pix = page.get_pixmap(matrix=pymupdf.Matrix(300 / 72, 300 / 72), clip=rect)
-
-        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-        bytes_io = io.BytesIO()
-        img.save(bytes_io, format="PNG")
-        return bytes_io.getvalue()
+        # Bounding box is scaled to 72 dots per inch. Render at up to 300 DPI, but cap the
+        # resolution so the longest side lands near the vision model's input size (~1536 px);
+        # a full-page figure at a fixed 300 DPI would be 10+ megapixels only to be downsampled
+        dpi = min(300, 1536 * 72 / max(rect.width, rect.height, 1))
+        pix = page.get_pixmap(matrix=pymupdf.Matrix(dpi / 72, dpi / 72), clip=rect)
+
+        # Encode straight from the native pixmap, avoiding a PIL roundtrip and an extra full-image copy.
+        # These crops are raster regions shipped to the describer over the network, where JPEG at
+        # quality 85 is several times smaller than lossless PNG for no perceptible difference.
+        return pix.tobytes("jpeg", jpg_quality=85)
@@ -47,3 +47,7 @@ class Strategy(ABC):
 
     async def run(self):
         raise NotImplementedError
+
+    async def teardown(self):
+        """Optional hook to release long-lived resources (clients, sessions) once ingestion is done"""
+        pass
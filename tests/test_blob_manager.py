@@ -67,11 +67,11 @@ async def test_upload_and_remove(monkeypatch, mock_env, blob_manager):
 
         monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.list_blob_names", mock_list_blob_names)
 
-        async def mock_delete_blob(self, name, *args, **kwargs):
-            assert name == filename
-            return True
+        async def mock_delete_blobs(self, *blob_names, **kwargs):
+            assert blob_names == (filename,)
+            return []
 
-        monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.delete_blob", mock_delete_blob)
+        monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.delete_blobs", mock_delete_blobs)
 
         await blob_manager.remove_blob(f.content.name)
 
@@ -120,11 +120,11 @@ async def test_upload_and_remove_all(monkeypatch, mock_env, blob_manager):
 
         monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.list_blob_names", mock_list_blob_names)
 
-        async def mock_delete_blob(self, name, *args, **kwargs):
-            assert name == filename
-            return True
+        async def mock_delete_blobs(self, *blob_names, **kwargs):
+            assert blob_names == (filename,)
+            return []
 
-        monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.delete_blob", mock_delete_blob)
+        monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.delete_blobs", mock_delete_blobs)
 
         await blob_manager.remove_blob()
 
@@ -204,10 +204,10 @@ async def test_dont_remove_if_no_container(monkeypatch, mock_env, blob_manager):
 
     monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.exists", mock_exists)
 
-    async def mock_delete_blob(*args, **kwargs):
-        assert False, "delete_blob() shouldn't have been called"
+    async def mock_delete_blobs(*args, **kwargs):
+        assert False, "delete_blobs() shouldn't have been called"
 
-    monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.delete_blob", mock_delete_blob)
+    monkeypatch.setattr("azure.storage.blob.aio.ContainerClient.delete_blobs", mock_delete_blobs)
 
     await blob_manager.remove_blob()
 
@@ -109,27 +109,27 @@ async def test_contentunderstanding_analyze(monkeypatch, caplog):
 
     monkeypatch.setattr(aiohttp.ClientSession, "put", mock_put)
 
-    describer = ContentUnderstandingDescriber(
+    async with ContentUnderstandingDescriber(
         endpoint="https://testcontentunderstanding.cognitiveservices.azure.com", credential=MockAzureCredential()
-    )
-    await describer.create_analyzer()
-    await describer.describe_image(b"imagebytes")
+    ) as describer:
+        await describer.create_analyzer()
+        await describer.describe_image(b"imagebytes")
 
-    describer_wrong_endpoint = ContentUnderstandingDescriber(
+    async with ContentUnderstandingDescriber(
         endpoint="https://wrongservicename.cognitiveservices.azure.com", credential=MockAzureCredential()
-    )
-    with pytest.raises(Exception):
-        await describer_wrong_endpoint.create_analyzer()
+    ) as describer_wrong_endpoint:
+        with pytest.raises(Exception):
+            await describer_wrong_endpoint.create_analyzer()
 
-    describer_existing_analyzer = ContentUnderstandingDescriber(
+    async with ContentUnderstandingDescriber(
         endpoint="https://existinganalyzer.cognitiveservices.azure.com", credential=MockAzureCredential()
-    )
-    with caplog.at_level(logging.INFO):
-        await describer_existing_analyzer.create_analyzer()
-        assert "Analyzer 'image_analyzer' already exists." in caplog.text
+    ) as describer_existing_analyzer:
+        with caplog.at_level(logging.INFO):
+            await describer_existing_analyzer.create_analyzer()
+            assert "Analyzer 'image_analyzer' already exists." in caplog.text
 
-    describer_bad_analyze = ContentUnderstandingDescriber(
+    async with ContentUnderstandingDescriber(
         endpoint="https://badanalyzer.cognitiveservices.azure.com", credential=MockAzureCredential()
-    )
-    with pytest.raises(Exception):
-        await describer_bad_analyze.describe_image(b"imagebytes")
+    ) as describer_bad_analyze:
+        with pytest.raises(Exception):
+            await describer_bad_analyze.describe_image(b"imagebytes")
@@ -22,7 +22,12 @@ from azure.core.exceptions import HttpResponseError
 from PIL import Image, ImageChops
 
 from prepdocslib.mediadescriber import ContentUnderstandingDescriber
-from prepdocslib.pdfparser import DocumentAnalysisParser
+from prepdocslib.pdfparser import (
+    ANALYZE_CHUNK_PAGES,
+    ANALYZE_CONCURRENT_MIN_PAGES,
+    DocumentAnalysisParser,
+    _split_pdf_bytes,
+)
 
 from .mocks import MockAzureCredential
 
@@ -52,7 +57,7 @@ def test_crop_image_from_pdf_page():
 
     # Verify the output is a valid image
     cropped_image = Image.open(io.BytesIO(cropped_image_bytes))
-    assert cropped_image.format == "PNG"
+    assert cropped_image.format == "JPEG"
     assert cropped_image.size[0] > 0
     assert cropped_image.size[1] > 0
 
@@ -136,7 +141,7 @@ async def test_figure_to_html_with_bounding_regions(monkeypatch, caplog):
 
     monkeypatch.setattr(cu_describer, "describe_image", mock_describe_image)
 
-    def mock_crop_image_from_pdf_page(doc, page_number, bounding_box) -> bytes:
+    def mock_crop_image_from_pdf_page(doc, page_number, bounding_box, page_cache=None) -> bytes:
         assert page_number == 0
         assert bounding_box == (1.4703, 2.8371, 5.5381, 6.6022)
         return b"image_bytes"
@@ -181,6 +186,42 @@ async def test_parse_simple(monkeypatch):
     assert pages[0].text == "Page content"
 
 
+@pytest.mark.asyncio
+async def test_parse_batch(monkeypatch):
+    mock_poller = MagicMock()
+
+    async def mock_begin_analyze_document(self, model_id, analyze_request, **kwargs):
+        return mock_poller
+
+    async def mock_poller_result():
+        return AnalyzeResult(
+            content="Page content",
+            pages=[DocumentPage(page_number=1, spans=[DocumentSpan(offset=0, length=12)])],
+            tables=[],
+            figures=[],
+        )
+
+    monkeypatch.setattr(DocumentIntelligenceClient, "begin_analyze_document", mock_begin_analyze_document)
+    monkeypatch.setattr(mock_poller, "result", mock_poller_result)
+
+    parser = DocumentAnalysisParser(
+        endpoint="https://example.com", credential=MockAzureCredential(), use_content_understanding=False
+    )
+    contents = []
+    for i in range(3):
+        content = io.BytesIO(b"pdf content bytes")
+        content.name = f"test{i}.pdf"
+        contents.append(content)
+    results = await parser.parse_batch(contents)
+
+    assert len(results) == 3
+    for pages in results:
+        assert len(pages) == 1
+        assert pages[0].page_num == 0
+        assert pages[0].offset == 0
+        assert pages[0].text == "Page content"
+
+
 @pytest.mark.asyncio
 async def test_parse_doc_with_tables(monkeypatch):
     mock_poller = MagicMock()
@@ -312,6 +353,83 @@ async def test_parse_doc_with_figures(monkeypatch):
     )
 
 
+def build_labeled_pdf_bytes(page_count: int) -> bytes:
+    """Build a PDF whose pages each carry their zero-based index as text, so a mock
+    analysis can tell which page range it was handed"""
+    doc = pymupdf.open()
+    for i in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), str(i))
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def test_split_pdf_bytes():
+    # Non-PDF content and small PDFs pass through as a single submission
+    assert _split_pdf_bytes(b"plain docx bytes") == [b"plain docx bytes"]
+    small_pdf_bytes = build_labeled_pdf_bytes(3)
+    assert _split_pdf_bytes(small_pdf_bytes) == [small_pdf_bytes]
+
+    # A PDF at the concurrency threshold splits into ranges of at most ANALYZE_CHUNK_PAGES pages
+    page_count = ANALYZE_CONCURRENT_MIN_PAGES + 5
+    chunks = _split_pdf_bytes(build_labeled_pdf_bytes(page_count))
+    assert len(chunks) == math.ceil(page_count / ANALYZE_CHUNK_PAGES)
+    next_label = 0
+    for chunk_bytes in chunks:
+        chunk_doc = pymupdf.open(stream=chunk_bytes, filetype="pdf")
+        assert chunk_doc.page_count <= ANALYZE_CHUNK_PAGES
+        # Each range picks up exactly where the previous one left off
+        assert chunk_doc.load_page(0).get_text().strip() == str(next_label)
+        next_label += chunk_doc.page_count
+        chunk_doc.close()
+    assert next_label == page_count
+
+
+@pytest.mark.asyncio
+async def test_parse_multiple_ranges(monkeypatch):
+    async def mock_begin_analyze_document(self, model_id, analyze_request, **kwargs):
+        chunk_doc = pymupdf.open(stream=analyze_request.bytes_source, filetype="pdf")
+        first_label = int(chunk_doc.load_page(0).get_text().strip())
+        page_texts = [f"content of page {first_label + i} " for i in range(chunk_doc.page_count)]
+        chunk_doc.close()
+        document_pages = []
+        chunk_offset = 0
+        for i, page_text in enumerate(page_texts):
+            document_pages.append(
+                DocumentPage(page_number=i + 1, spans=[DocumentSpan(offset=chunk_offset, length=len(page_text))])
+            )
+            chunk_offset += len(page_text)
+        analyze_result = AnalyzeResult(content="".join(page_texts), pages=document_pages, tables=[], figures=[])
+
+        mock_poller = MagicMock()
+
+        async def mock_poller_result():
+            return analyze_result
+
+        mock_poller.result = mock_poller_result
+        return mock_poller
+
+    monkeypatch.setattr(DocumentIntelligenceClient, "begin_analyze_document", mock_begin_analyze_document)
+
+    parser = DocumentAnalysisParser(
+        endpoint="https://example.com", credential=MockAzureCredential(), use_content_understanding=False
+    )
+    page_count = ANALYZE_CONCURRENT_MIN_PAGES + 5
+    content = io.BytesIO(build_labeled_pdf_bytes(page_count))
+    content.name = "test.pdf"
+    pages = [page async for page in parser.parse(content)]
+
+    # Page numbers and offsets must be contiguous across the range boundaries
+    assert len(pages) == page_count
+    expected_offset = 0
+    for i, page in enumerate(pages):
+        assert page.page_num == i
+        assert page.offset == expected_offset
+        assert page.text == f"content of page {i}"
+        expected_offset += len(page.text)
+
+
 @pytest.mark.asyncio
 async def test_parse_unsupportedformat(monkeypatch, caplog):
     mock_poller = MagicMock()